@@ -1,128 +1,173 @@
 #!/usr/bin/env python3
 import re
-from dataclasses import dataclass
-from typing import List, Optional, Any
+import sys
+from array import array
+from pathlib import Path
+from typing import Dict, List, Optional, Any, Sequence, Final, Tuple, Union
 
 # =======================
 # TOKEN
 # =======================
 
-@dataclass
 class Token:
-    type: str   # IDENT, NUMBER, STRING, KEYWORD, DATATYPE, RELOP, SYMBOL, BOOL, EOF
-    lexeme: str
-    line: int
+    __slots__ = ("type", "lexeme", "line")
 
-    def __repr__(self):
-        return f"Token({self.type}, '{self.lexeme}', line={self.line})"
+    # type and lexeme are interned here, so every later pass can rely on equal
+    # lexemes/type names being the same object (identity-fast comparisons)
+    def __init__(self, type: str, lexeme: str, line: int):
+        self.type = sys.intern(type)   # IDENT, NUMBER, STRING, KEYWORD, DATATYPE, RELOP, SYMBOL, BOOL, EOF
+        self.lexeme = sys.intern(lexeme)
+        self.line = line
+
+    def __repr__(self) -> str:
+        return "Token(%s, '%s', line=%d)" % (self.type, self.lexeme, self.line)
 
 
 # =======================
 # SCANNER
 # =======================
 
-DATATYPES = {"d7krqm", "d7k34ry", "d7kmslsl", "d7kmntq"}
+# type names, shared by the scanner tables and the semantic pass
+INT_T = sys.intern("d7krqm")
+FLOAT_T = sys.intern("d7k34ry")
+STR_T = sys.intern("d7kmslsl")
+BOOL_T = sys.intern("d7kmntq")
+
+DATATYPES = {INT_T, FLOAT_T, STR_T, BOOL_T}
 KEYWORDS = {
     "d7ktba3a", "d7ked5al", "d7klo", "d7k8er",
     "d7kdw5ny", "d7klf", "d7krg3", "d7kbdaya"
 }
 BOOL_LITERALS = {"true", "false"}
 
+# word -> token type, so classifying an IDENT match is a single dict probe
+IDENT_KIND = {
+    **{word: "DATATYPE" for word in DATATYPES},
+    **{word: "KEYWORD" for word in KEYWORDS},
+    **{word: "BOOL" for word in BOOL_LITERALS},
+}
+
+# operator -> token type for OP matches; anything not listed is a SYMBOL
+OP_KIND = {op: "RELOP" for op in ("==", "!=", "<=", ">=", "<", ">")}
+
 SCANNER_PATTERNS = [
-    ("WHITESPACE", re.compile(r'[ \t\r\n]+')),
-    ("COMMENT",    re.compile(r'//[^\n]*')),
-    ("STRING",     re.compile(r'"([^"\\\n]|\\.)*"')),
-    ("RELOP",      re.compile(r'==|!=|<=|>=|<|>')),
-    ("SYMBOL",     re.compile(r'[{}(),;=+\-*/]')),
-    ("NUMBER",     re.compile(r'\d+(\.\d+)?')),
-    ("IDENT",      re.compile(r'[A-Za-z_]\w*')),
+    # a whole run of whitespace and // comments is one match
+    ("SKIP",       r'(?:[ \t\r\n]+|//[^\n]*)+'),
+    ("STRING",     r'"[^"\\\n]*(?:\\.[^"\\\n]*)*"'),   # unrolled loop: no ambiguous backtracking
+    # relops and symbols in one branch, two-char operators first so they win
+    ("OP",         r'==|!=|<=|>=|[<>{}(),;=+\-*/]'),
+    ("NUMBER",     r'\d+(?:\.\d+)?'),
+    ("IDENT",      r'[A-Za-z_]\w*'),
 ]
 
+# one alternation of named groups, so the regex engine (not Python) walks the source
+MASTER_RE = re.compile("|".join(f"(?P<{name}>{pattern})" for name, pattern in SCANNER_PATTERNS))
+
 def scan_source(source: str) -> List[Token]:
     tokens: List[Token] = []
     pos = 0
     line = 1
-    n = len(source)
-
-    while pos < n:
-        match = None
-        kind = None
-        for name, pattern in SCANNER_PATTERNS:
-            m = pattern.match(source, pos)
-            if m:
-                match = m
-                kind = name
-                break
-
-        if not match:
-            context = source[pos:pos+20].replace("\n", "\\n")
-            raise SyntaxError(f"Unknown character at line {line}: {context!r}")
-
-        text = match.group(0)
-        line += text.count("\n")
-
-        if kind in ("WHITESPACE", "COMMENT"):
-            pass
+    # globals and bound methods used per token, as locals
+    append = tokens.append
+    ident_kind = IDENT_KIND.get
+    op_kind = OP_KIND.get
+
+    for match in MASTER_RE.finditer(source):
+        if match.start() != pos:
+            break  # gap: finditer skipped an unknown character
+
+        kind = match.lastgroup
+        text = match.group()
+        if kind == "SKIP":
+            # only whitespace/comment runs can span lines: no other token contains "\n"
+            line += text.count("\n")
+            pos = match.end()
+            continue
+
+        # words and operators are classified by table, strings lose their quotes,
+        # and the only group left is NUMBER; most common case first
+        if kind == "IDENT":
+            append(Token(ident_kind(text, "IDENT"), text, line))
+        elif kind == "OP":
+            append(Token(op_kind(text, "SYMBOL"), text, line))
         elif kind == "STRING":
             inner = text[1:-1]  # drop quotes
-            tokens.append(Token("STRING", inner, line))
-        elif kind == "NUMBER":
-            tokens.append(Token("NUMBER", text, line))
-        elif kind == "RELOP":
-            tokens.append(Token("RELOP", text, line))
-        elif kind == "SYMBOL":
-            tokens.append(Token("SYMBOL", text, line))
-        elif kind == "IDENT":
-            if text in DATATYPES:
-                tokens.append(Token("DATATYPE", text, line))
-            elif text in KEYWORDS:
-                tokens.append(Token("KEYWORD", text, line))
-            elif text in BOOL_LITERALS:
-                tokens.append(Token("BOOL", text, line))
-            else:
-                tokens.append(Token("IDENT", text, line))
+            append(Token("STRING", inner, line))
         else:
-            tokens.append(Token(kind, text, line))
+            append(Token("NUMBER", text, line))
 
         pos = match.end()
 
+    if pos != len(source):
+        context = source[pos:pos+20].replace("\n", "\\n")
+        raise SyntaxError(f"Unknown character at line {line}: {context!r}")
+
     tokens.append(Token("EOF", "EOF", line))
     return tokens
 
 def scan_file(filename: str) -> List[Token]:
-    with open(filename, "r", encoding="utf-8") as f:
-        return scan_source(f.read())
+    return scan_source(Path(filename).read_text(encoding="utf-8"))
 
 
 # =======================
 # AST NODE
 # =======================
 
+# shared by every childless node (most of the AST is leaves); add() swaps in a real list
+NO_CHILDREN: Tuple["ASTNode", ...] = ()
+
+
+# leaf types the parser shares per Parser (see Parser._leaf); they never take children
+SHARED_LEAF_TYPES: Final = frozenset(("NumberLiteral", "BoolLiteral", "Identifier"))
+
+
 class ASTNode:
+    __slots__ = ("node_type", "value", "children")
+
     def __init__(self, node_type: str, value: Optional[Any] = None, children: Optional[List['ASTNode']] = None):
         self.node_type = node_type
         self.value = value
-        self.children: List[ASTNode] = children or []
-
-    def add(self, node: 'ASTNode'):
-        self.children.append(node)
+        self.children: Union[List[ASTNode], Tuple[ASTNode, ...]] = children if children is not None else NO_CHILDREN
+
+    def add(self, node: 'ASTNode') -> None:
+        if self.node_type in SHARED_LEAF_TYPES:
+            # the parser shares these nodes; a child would show up at every use
+            raise TypeError(f"{self.node_type} nodes cannot have children")
+        children = self.children
+        if isinstance(children, list):
+            children.append(node)
+        else:
+            self.children = [node]
 
-    def __repr__(self):
+    def __repr__(self) -> str:
         if self.children:
             return f"{self.node_type}({self.value}, children={len(self.children)})"
         else:
             return f"{self.node_type}({self.value})"
 
 
-def pretty_print(node: ASTNode, prefix: str = "", is_last: bool = True):
-    connector = "└── " if is_last else "├── "
-    label = f"{node.node_type}"
-    if node.value is not None:
-        label += f": {node.value}"
-    print(prefix + connector + label)
-    prefix += "    " if is_last else "│   "
-    for i, child in enumerate(node.children):
-        pretty_print(child, prefix, i == len(node.children) - 1)
+# tree-drawing pieces for pretty_print, indexed by is_last
+CONNECTORS: Final = ("├── ", "└── ")
+PADS: Final = ("│   ", "    ")
+
+
+def pretty_print(node: ASTNode, prefix: str = "", is_last: bool = True) -> None:
+    # iterative walk (no recursion limit on deep trees), written out in one call
+    out: List[str] = []
+    stack = [(node, prefix, is_last)]
+    while stack:
+        node, prefix, is_last = stack.pop()
+        if node.value is None:
+            out.append(prefix + CONNECTORS[is_last] + node.node_type)
+        else:
+            out.append(f"{prefix}{CONNECTORS[is_last]}{node.node_type}: {node.value}")
+        prefix += PADS[is_last]
+        # push in reverse so children pop in source order
+        kids = node.children
+        last = len(kids) - 1
+        for i in range(last, -1, -1):
+            stack.append((kids[i], prefix, i == last))
+    sys.stdout.write("\n".join(out) + "\n")
 
 
 # =======================
@@ -130,74 +175,152 @@ def pretty_print(node: ASTNode, prefix: str = "", is_last: bool = True):
 # =======================
 
 class ParserError(Exception):
-    pass
+    # Raised with a %-format string and its arguments; the message (and the
+    # Token reprs in it) is only built when the error is actually displayed.
+    # args keeps the arguments too, so e.args/repr(e) still carry the details.
+    def __init__(self, fmt: str, *fmt_args: Any):
+        super().__init__(fmt, *fmt_args)
+        self.fmt = fmt
+        self.fmt_args = fmt_args
+
+    def __str__(self):
+        if not self.fmt_args:
+            return self.fmt
+        return self.fmt % self.fmt_args
+
+
+# binary operator -> (left, right) binding power; higher binds tighter, and
+# right = left + 1 makes every level left-associative.
+# Keys are interned: CPython does not intern constants like "<=" by itself, and
+# Token interns lexemes, so this makes every operator lookup an identity hit.
+BINDING_POWER: Final = {sys.intern(op): bp for op, bp in {
+    "==": (10, 11), "!=": (10, 11),
+    "<": (20, 21), ">": (20, 21), "<=": (20, 21), ">=": (20, 21),
+    "+": (30, 31), "-": (30, 31),
+    "*": (40, 41), "/": (40, 41),
+}.items()}
+
+# token types as small ints, so the parser's type checks are int compares
+# on a compact array; the names are only needed again for error messages
+KIND_NAMES: Final = ("KEYWORD", "IDENT", "NUMBER", "STRING", "SYMBOL", "RELOP", "DATATYPE", "BOOL", "EOF")
+K_KEYWORD, K_IDENT, K_NUMBER, K_STRING, K_SYMBOL, K_RELOP, K_DATATYPE, K_BOOL, K_EOF = range(len(KIND_NAMES))
+TOKEN_KIND: Final = {name: k for k, name in enumerate(KIND_NAMES)}
+
+# token kinds that can carry a binary operator
+OPERATOR_KINDS: Final = frozenset((K_RELOP, K_SYMBOL))
+
+# literal token kind -> AST node type, for Parser.primary
+LITERAL_NODES: Final = {
+    K_NUMBER: "NumberLiteral",
+    K_STRING: "StringLiteral",
+    K_BOOL: "BoolLiteral",
+}
 
 
 class Parser:
-    def __init__(self, tokens: List[Token]):
-        self.tokens = tokens
-        self.pos = 0
+    def __init__(self, tokens: Sequence[Token]):
+        # a private immutable copy: the caller's list can't drift out of sync
+        # with lex/kind below, and tuples index a little faster than lists
+        tokens = tuple(tokens)
+        # the stream always ends in one EOF token that the parser never moves past,
+        # so current()/peek() can index without bounds checks
+        if not tokens or tokens[-1].type != "EOF":
+            tokens += (Token("EOF", "EOF", tokens[-1].line if tokens else 1),)
+        self.tokens: Tuple[Token, ...] = tokens
+        # the same stream split into parallel lexeme/kind arrays: hot paths read
+        # self.lex[self.pos] / self.kind[self.pos] instead of loading a Token and
+        # then its attribute; self.tokens stays for error messages and line numbers
+        self.lex: Tuple[str, ...] = tuple([t.lexeme for t in tokens])
+        self.kind: array = array("B", [TOKEN_KIND[t.type] for t in tokens])
+        self._eof_pos: int = len(tokens) - 1
+        self.pos: int = 0
+        # flyweight leaves for this parser: (node_type, value) -> one shared node.
+        # Bounded by the distinct names/numbers in the source; cleared per parse()
+        self._leaves: Dict[Tuple[str, str], ASTNode] = {}
+        # saved positions for backtracking; a typed int array, so saving a
+        # position does not allocate a Python int object per entry
+        self._posstack: array = array("i")
 
     def current(self) -> Token:
         return self.tokens[self.pos]
 
     def peek(self, offset: int = 1) -> Token:
-        idx = self.pos + offset
-        if idx < len(self.tokens):
-            return self.tokens[idx]
-        return Token("EOF", "EOF", self.current().line)
+        return self.tokens[min(self.pos + offset, self._eof_pos)]
 
     def advance(self) -> Token:
-        tok = self.current()
-        if self.pos < len(self.tokens):
+        tok = self.tokens[self.pos]
+        if self.pos < self._eof_pos:
             self.pos += 1
         return tok
 
-    def match_lexeme(self, lexeme: str):
-        tok = self.current()
-        if tok.lexeme == lexeme:
+    def _leaf(self, node_type: str, value: str) -> ASTNode:
+        key = (node_type, value)
+        node = self._leaves.get(key)
+        if node is None:
+            node = self._leaves[key] = ASTNode(node_type, value)
+        return node
+
+    # ---- backtracking marks (for rules that try alternatives) ----
+    def _save(self) -> None:
+        self._posstack.append(self.pos)
+
+    def _restore(self) -> None:
+        self.pos = self._posstack.pop()
+
+    def _discard(self) -> None:
+        # the alternative matched: forget the mark without rewinding
+        self._posstack.pop()
+
+    # Lexemes are interned by Token and the literals passed here are interned by
+    # CPython, so `is` settles nearly every check; == only backs it up for
+    # callers that pass a runtime-built string.
+    def match_lexeme(self, lexeme: str) -> Token:
+        tok_lexeme = self.lex[self.pos]
+        if tok_lexeme is lexeme or tok_lexeme == lexeme:
             return self.advance()
-        raise ParserError(f"Expected '{lexeme}' but got {tok} at pos {self.pos}")
+        raise ParserError("Expected '%s' but got %r at pos %d", lexeme, self.current(), self.pos)
 
-    def match_type(self, t: str):
-        tok = self.current()
-        if tok.type == t:
+    def match_type(self, kind: int) -> Token:
+        if self.kind[self.pos] == kind:
             return self.advance()
-        raise ParserError(f"Expected type {t} but got {tok} at pos {self.pos}")
+        raise ParserError("Expected type %s but got %r at pos %d", KIND_NAMES[kind], self.current(), self.pos)
 
     def accept_lexeme(self, lexeme: str) -> Optional[Token]:
-        tok = self.current()
-        if tok.lexeme == lexeme:
+        tok_lexeme = self.lex[self.pos]
+        if tok_lexeme is lexeme or tok_lexeme == lexeme:
             return self.advance()
         return None
 
     # ---- entry ----
     def parse(self) -> ASTNode:
         program = ASTNode("Program")
+        self._leaves.clear()
 
         # { FunctionDecl } MainFunction EOF
-        while not (self.current().type == "KEYWORD" and self.current().lexeme == "d7kbdaya"):
-            if self.current().type == "EOF":
+        lex = self.lex
+        kind = self.kind
+        while not (kind[self.pos] == K_KEYWORD and lex[self.pos] == "d7kbdaya"):
+            if kind[self.pos] == K_EOF:
                 raise ParserError("Missing main function 'd7kbdaya'")
             program.add(self.function_decl())
 
         program.add(self.main_function())
 
-        if self.current().type != "EOF":
-            raise ParserError(f"Nothing allowed after main, got {self.current()}")
+        if kind[self.pos] != K_EOF:
+            raise ParserError("Nothing allowed after main, got %r", self.current())
         return program
 
     # ---- function declarations ----
     def function_decl(self) -> ASTNode:
         # Type IDENT '(' ParamList? ')' Block
-        ret_type_tok = self.match_type("DATATYPE")
+        ret_type_tok = self.match_type(K_DATATYPE)
         ret_type = ret_type_tok.lexeme
-        name_tok = self.match_type("IDENT")
+        name_tok = self.match_type(K_IDENT)
         name = name_tok.lexeme
 
         self.match_lexeme("(")
         params: List[ASTNode] = []
-        if self.current().lexeme != ")":
+        if self.lex[self.pos] != ")":
             params.append(self.param())
             while self.accept_lexeme(","):
                 params.append(self.param())
@@ -205,104 +328,81 @@ class Parser:
 
         block = self.block()
 
-        node = ASTNode("FunctionDecl", name)
-        node.add(ASTNode("ReturnType", ret_type))
-        params_node = ASTNode("Params")
-        for p in params:
-            params_node.add(p)
-        node.add(params_node)
-        node.add(block)
-        return node
+        return ASTNode("FunctionDecl", name, [
+            ASTNode("ReturnType", ret_type),
+            ASTNode("Params", children=params),
+            block,
+        ])
 
     def param(self) -> ASTNode:
-        dtype_tok = self.match_type("DATATYPE")
-        ident_tok = self.match_type("IDENT")
-        p = ASTNode("Param")
-        p.add(ASTNode("Type", dtype_tok.lexeme))
-        p.add(ASTNode("Identifier", ident_tok.lexeme))
-        return p
+        dtype_tok = self.match_type(K_DATATYPE)
+        ident_tok = self.match_type(K_IDENT)
+        return ASTNode("Param", children=[
+            ASTNode("Type", dtype_tok.lexeme),
+            ASTNode("Identifier", ident_tok.lexeme),
+        ])
 
     def main_function(self) -> ASTNode:
         # d7kbdaya() Block
-        tok = self.current()
-        if not (tok.type == "KEYWORD" and tok.lexeme == "d7kbdaya"):
-            raise ParserError(f"Expected 'd7kbdaya' for main, got {tok}")
-        self.advance()
+        pos = self.pos
+        if not (self.kind[pos] == K_KEYWORD and self.lex[pos] == "d7kbdaya"):
+            raise ParserError("Expected 'd7kbdaya' for main, got %r", self.current())
+        self.pos = pos + 1
         self.match_lexeme("(")
         self.match_lexeme(")")
         block = self.block()
-        node = ASTNode("MainFunc", "d7kbdaya")
-        node.add(block)
-        return node
+        return ASTNode("MainFunc", "d7kbdaya", [block])
 
     # ---- block & statements ----
     def block(self) -> ASTNode:
+        # '{' StatementList '}', collected locally and handed to the Block in one go
         self.match_lexeme("{")
-        stmts = self.statement_list()
+        stmts: List[ASTNode] = []
+        append = stmts.append
+        lex = self.lex
+        kind = self.kind
+        eof_pos = self._eof_pos
+        pos = self.pos
+        while pos < eof_pos and lex[pos] != "}":
+            # statement()'s dispatch, inlined: one Python frame less per statement
+            k = kind[pos]
+            handler = STMT_DISPATCH.get(lex[pos]) if k == K_KEYWORD else STMT_BY_KIND.get(k)
+            if handler is None:
+                raise ParserError("Unexpected statement start: %r", self.current())
+            append(handler(self))
+            pos = self.pos  # reload after the nested parse moved it
         self.match_lexeme("}")
-        return ASTNode("Block", children=stmts.children)
-
-    def statement_list(self) -> ASTNode:
-        node = ASTNode("StatementList")
-        while self.current().type != "EOF" and self.current().lexeme != "}":
-            stmt = self.statement()
-            node.add(stmt)
-        return node
+        return ASTNode("Block", children=stmts)
 
     def statement(self) -> ASTNode:
-        tok = self.current()
-
-        # VarDecl
-        if tok.type == "DATATYPE":
-            return self.vardecl()
-
-        # Assignment (IDENT = ...)
-        if tok.type == "IDENT":
-            # could also be a function call as statement in future; for now, we treat calls only in expressions.
-            return self.assignment_stmt()
-
-        if tok.type == "KEYWORD":
-            if tok.lexeme == "d7klo":
-                return self.if_stmt()
-            if tok.lexeme == "d7kdw5ny":
-                return self.while_stmt()
-            if tok.lexeme == "d7klf":
-                return self.for_stmt()
-            if tok.lexeme == "d7ktba3a":
-                return self.output_stmt()
-            if tok.lexeme == "d7ked5al":
-                return self.input_stmt()
-            if tok.lexeme == "d7krg3":
-                return self.return_stmt()
-
-        raise ParserError(f"Unexpected statement start: {tok}")
+        # block() inlines this dispatch; kept for parsing a single statement
+        pos = self.pos
+        kind = self.kind[pos]
+        handler = STMT_DISPATCH.get(self.lex[pos]) if kind == K_KEYWORD else STMT_BY_KIND.get(kind)
+        if handler is None:
+            raise ParserError("Unexpected statement start: %r", self.current())
+        return handler(self)
 
     def vardecl(self) -> ASTNode:
-        dtype_tok = self.match_type("DATATYPE")
+        dtype_tok = self.match_type(K_DATATYPE)
         dtype = dtype_tok.lexeme
-        ident_tok = self.match_type("IDENT")
+        ident_tok = self.match_type(K_IDENT)
         name = ident_tok.lexeme
 
-        node = ASTNode("VarDecl", dtype)
-        node.add(ASTNode("Identifier", name))
-
+        children = [ASTNode("Identifier", name)]
         if self.accept_lexeme("="):
-            expr = self.expr()
-            node.add(expr)
+            children.append(self.expr())
 
         self.match_lexeme(";")
-        return node
+        return ASTNode("VarDecl", dtype, children)
 
     def assignment_stmt(self) -> ASTNode:
-        ident_tok = self.match_type("IDENT")
+        ident_tok = self.match_type(K_IDENT)
         name = ident_tok.lexeme
         self.match_lexeme("=")
         expr = self.expr()
         self.match_lexeme(";")
-        node = ASTNode("Assign")
-        node.add(ASTNode("Identifier", name))
-        node.add(expr)
-        return node
+        return ASTNode("Assign", children=[ASTNode("Identifier", name), expr])
 
     def if_stmt(self) -> ASTNode:
         self.match_lexeme("d7klo")
@@ -310,15 +410,12 @@ class Parser:
         cond = self.expr()
         self.match_lexeme(")")
         then_block = self.block()
-        node = ASTNode("If")
-        node.add(cond)
-        node.add(then_block)
+        children = [cond, then_block]
 
-        if self.current().lexeme == "d7k8er":
+        if self.lex[self.pos] == "d7k8er":
             self.advance()
-            else_block = self.block()
-            node.add(else_block)
-        return node
+            children.append(self.block())
+        return ASTNode("If", children=children)
 
     def while_stmt(self) -> ASTNode:
         self.match_lexeme("d7kdw5ny")
@@ -326,10 +423,7 @@ class Parser:
         cond = self.expr()
         self.match_lexeme(")")
         body = self.block()
-        node = ASTNode("While")
-        node.add(cond)
-        node.add(body)
-        return node
+        return ASTNode("While", children=[cond, body])
 
     def for_stmt(self) -> ASTNode:
         # d7klf ( Assignment ; Expr ; Assignment ) Block
@@ -342,22 +436,14 @@ class Parser:
         update = self.assignment_stmt_no_semicolon()
         self.match_lexeme(")")
         body = self.block()
-        node = ASTNode("For")
-        node.add(init)
-        node.add(cond)
-        node.add(update)
-        node.add(body)
-        return node
+        return ASTNode("For", children=[init, cond, update, body])
 
     def assignment_stmt_no_semicolon(self) -> ASTNode:
-        ident_tok = self.match_type("IDENT")
+        ident_tok = self.match_type(K_IDENT)
         name = ident_tok.lexeme
         self.match_lexeme("=")
         expr = self.expr()
-        node = ASTNode("Assign")
-        node.add(ASTNode("Identifier", name))
-        node.add(expr)
-        return node
+        return ASTNode("Assign", children=[ASTNode("Identifier", name), expr])
 
     def output_stmt(self) -> ASTNode:
         self.match_lexeme("d7ktba3a")
@@ -365,112 +451,127 @@ class Parser:
         expr = self.expr()
         self.match_lexeme(")")
         self.match_lexeme(";")
-        node = ASTNode("Output")
-        node.add(expr)
-        return node
+        return ASTNode("Output", children=[expr])
 
     def input_stmt(self) -> ASTNode:
         self.match_lexeme("d7ked5al")
         self.match_lexeme("(")
-        ident_tok = self.match_type("IDENT")
+        ident_tok = self.match_type(K_IDENT)
         self.match_lexeme(")")
         self.match_lexeme(";")
-        node = ASTNode("Input")
-        node.add(ASTNode("Identifier", ident_tok.lexeme))
-        return node
+        return ASTNode("Input", children=[ASTNode("Identifier", ident_tok.lexeme)])
 
     def return_stmt(self) -> ASTNode:
         self.match_lexeme("d7krg3")
-        node = ASTNode("Return")
-        if self.current().lexeme != ";":
-            expr = self.expr()
-            node.add(expr)
+        children = [self.expr()] if self.lex[self.pos] != ";" else None
         self.match_lexeme(";")
-        return node
+        return ASTNode("Return", children=children)
 
     # ---- expressions ----
-    def expr(self) -> ASTNode:
-        return self.equality()
-
-    def equality(self) -> ASTNode:
-        node = self.relational()
-        while self.current().type == "RELOP" and self.current().lexeme in ("==", "!="):
-            op = self.advance().lexeme
-            right = self.relational()
-            node = ASTNode("BinaryOp", op, [node, right])
-        return node
-
-    def relational(self) -> ASTNode:
-        node = self.add()
-        while self.current().type == "RELOP" and self.current().lexeme in ("<", ">", "<=", ">="):
-            op = self.advance().lexeme
-            right = self.add()
-            node = ASTNode("BinaryOp", op, [node, right])
-        return node
-
-    def add(self) -> ASTNode:
-        node = self.mul()
-        while self.current().lexeme in ("+", "-"):
-            op = self.advance().lexeme
-            right = self.mul()
-            node = ASTNode("BinaryOp", op, [node, right])
-        return node
-
-    def mul(self) -> ASTNode:
-        node = self.primary()
-        while self.current().lexeme in ("*", "/"):
-            op = self.advance().lexeme
-            right = self.primary()
-            node = ASTNode("BinaryOp", op, [node, right])
-        return node
+    def expr(self, min_bp: int = 0) -> ASTNode:
+        # Pratt loop over BINDING_POWER: Equality/Relational/Add/Mul from the
+        # grammar share one loop instead of one method per level.
+        # self.lex, self.kind, BINDING_POWER.get and expr are bound to locals for the loop.
+        lex = self.lex
+        kind = self.kind
+        bp_of = BINDING_POWER.get
+        expr = self.expr
+        left = self.primary()
+        while True:
+            pos = self.pos  # reload after the nested parse moved it
+            # only operator tokens: a STRING whose text is "==" is not an operator
+            if kind[pos] not in OPERATOR_KINDS:
+                return left
+            op = lex[pos]
+            bp = bp_of(op)
+            if bp is None or bp[0] < min_bp:
+                return left
+            self.pos = pos + 1
+            left = ASTNode("BinaryOp", op, [left, expr(bp[1])])
 
     def primary(self) -> ASTNode:
-        tok = self.current()
-
-        # NUMBER
-        if tok.type == "NUMBER":
-            self.advance()
-            return ASTNode("NumberLiteral", tok.lexeme)
-
-        # STRING
-        if tok.type == "STRING":
-            self.advance()
-            return ASTNode("StringLiteral", tok.lexeme)
-
-        # BOOL
-        if tok.type == "BOOL":
-            self.advance()
-            return ASTNode("BoolLiteral", tok.lexeme)
+        lex = self.lex
+        pos = self.pos
+        lexeme = lex[pos]
+        kind = self.kind[pos]
+
+        # NUMBER / STRING / BOOL
+        literal = LITERAL_NODES.get(kind)
+        if literal:
+            self.pos = pos + 1
+            if kind == K_STRING:
+                # strings can be any length; not worth pinning in the leaf cache
+                return ASTNode(literal, lexeme)
+            return self._leaf(literal, lexeme)
 
         # IDENT / CallExpr
-        if tok.type == "IDENT":
+        if kind == K_IDENT:
             # function call?
-            if self.peek().lexeme == "(":
-                name = tok.lexeme
-                self.advance()  # IDENT
-                self.match_lexeme("(")
+            if lex[pos + 1] == "(":  # an IDENT is never the EOF sentinel
+                name = lexeme
+                self.pos = pos + 2  # IDENT '('
                 args: List[ASTNode] = []
-                if self.current().lexeme != ")":
+                if lex[self.pos] != ")":
                     args.append(self.expr())
                     while self.accept_lexeme(","):
                         args.append(self.expr())
                 self.match_lexeme(")")
-                node = ASTNode("Call", name)
-                for a in args:
-                    node.add(a)
-                return node
+                return ASTNode("Call", name, args)
             else:
-                self.advance()
-                return ASTNode("Identifier", tok.lexeme)
+                self.pos = pos + 1
+                return self._leaf("Identifier", lexeme)
 
         # ( Expr )
-        if tok.lexeme == "(":
-            self.advance()
+        if lexeme == "(":
+            self.pos = pos + 1
             node = self.expr()
             self.match_lexeme(")")
             return node
 
-        raise ParserError(f"Unexpected token in expression: {tok}")
+        raise ParserError("Unexpected token in expression: %r", self.current())
+
+
+class MemoParser(Parser):
+    # Parser with a packrat cache on expr: (start pos, min_bp) -> (end pos, node).
+    # The grammar is LL(1) today, so this only pays off once rules backtrack;
+    # Parser itself carries no memo state or checks.
+    def __init__(self, tokens: Sequence[Token]):
+        super().__init__(tokens)
+        self._memo: Dict[Tuple[int, int], Tuple[int, ASTNode]] = {}
+
+    def parse(self) -> ASTNode:
+        self._memo.clear()
+        return super().parse()
+
+    def expr(self, min_bp: int = 0) -> ASTNode:
+        # Parser.expr recurses through self.expr, so nested operands hit the cache too
+        key = (self.pos, min_bp)
+        hit = self._memo.get(key)
+        if hit is not None:
+            self.pos = hit[0]
+            return hit[1]
+        node = super().expr(min_bp)
+        self._memo[key] = (self.pos, node)
+        return node
+
+
+# keyword lexeme -> statement parser (unbound; called as handler(parser)).
+# Built once here rather than per Parser instance.
+STMT_DISPATCH: Final = {
+    "d7klo": Parser.if_stmt,
+    "d7kdw5ny": Parser.while_stmt,
+    "d7klf": Parser.for_stmt,
+    "d7ktba3a": Parser.output_stmt,
+    "d7ked5al": Parser.input_stmt,
+    "d7krg3": Parser.return_stmt,
+}
+
+# non-keyword statement starts: VarDecl, and Assignment (IDENT = ...).
+# An IDENT could also be a function call as statement in future; for now, we treat calls only in expressions.
+STMT_BY_KIND: Final = {
+    K_DATATYPE: Parser.vardecl,
+    K_IDENT: Parser.assignment_stmt,
+}
 
 
 # =======================
@@ -481,6 +582,11 @@ class SemanticError(Exception):
     pass
 
 
+ARITH_OPS: Final = frozenset(("+", "-", "*", "/"))
+COMPARE_OPS: Final = frozenset(map(sys.intern, ("<", ">", "<=", ">=", "==", "!=")))  # interned like BINDING_POWER
+NUMERIC_TYPES: Final = frozenset((INT_T, FLOAT_T))
+
+
 class SymbolTable:
     def __init__(self):
         self.scopes = [{}]  # list of dicts
@@ -497,6 +603,10 @@ class SymbolTable:
         self.scopes[-1][name] = dtype
 
     def lookup(self, name: str) -> str:
+        # most lookups hit the innermost scope
+        dtype = self.scopes[-1].get(name)
+        if dtype is not None:
+            return dtype
         for scope in reversed(self.scopes):
             if name in scope:
                 return scope[name]
@@ -525,13 +635,18 @@ class SemanticAnalyzer:
         self.functions = FunctionTable()
         self.current_return_type: Optional[str] = None
         self.pending_params: Optional[List[tuple[str, str]]] = None  # (name, type)
+        # node_type -> bound visit_* method, resolved once instead of per visit
+        self._visitors = {
+            name[len("visit_"):]: getattr(self, name)
+            for name in dir(self)
+            if name.startswith("visit_") and name != "visit_generic"
+        }
 
     def analyze(self):
         self.visit(self.root)
 
     def visit(self, node: ASTNode):
-        method = getattr(self, f"visit_{node.node_type}", self.visit_generic)
-        return method(node)
+        return self._visitors.get(node.node_type, self.visit_generic)(node)
 
     def visit_generic(self, node: ASTNode):
         for c in node.children:
@@ -614,37 +729,37 @@ class SemanticAnalyzer:
 
     def visit_NumberLiteral(self, node: ASTNode):
         if "." in node.value:
-            return "d7k34ry"
-        return "d7krqm"
+            return FLOAT_T
+        return INT_T
 
     def visit_StringLiteral(self, node: ASTNode):
-        return "d7kmslsl"
+        return STR_T
 
     def visit_BoolLiteral(self, node: ASTNode):
-        return "d7kmntq"
+        return BOOL_T
 
     def visit_BinaryOp(self, node: ASTNode):
         op = node.value
         left_t = self.visit(node.children[0])
         right_t = self.visit(node.children[1])
         
-        if op in ("+", "-", "*", "/"):
-            if left_t not in ("d7krqm", "d7k34ry") or right_t not in ("d7krqm", "d7k34ry"):
+        if op in ARITH_OPS:
+            if left_t not in NUMERIC_TYPES or right_t not in NUMERIC_TYPES:
                 raise SemanticError(f"Operator '{op}' requires numeric operands, got {left_t} and {right_t}")
-            if left_t == "d7k34ry" or right_t == "d7k34ry":
-                return "d7k34ry"
-            return "d7krqm"
+            if left_t == FLOAT_T or right_t == FLOAT_T:
+                return FLOAT_T
+            return INT_T
 
-        if op in ("<", ">", "<=", ">=", "==", "!="):
+        if op in COMPARE_OPS:
             if left_t != right_t:
                 raise SemanticError(f"Comparison '{op}' with mismatched types {left_t} and {right_t}")
-            return "d7kmntq"
+            return BOOL_T
 
         raise SemanticError(f"Unknown binary operator '{op}'")
 
     def visit_If(self, node: ASTNode):
         cond_type = self.visit(node.children[0])
-        if cond_type != "d7kmntq":
+        if cond_type != BOOL_T:
             raise SemanticError(f"If condition must be bool (d7kmntq), got {cond_type}")
         self.visit(node.children[1])
         if len(node.children) == 3:
@@ -652,7 +767,7 @@ class SemanticAnalyzer:
 
     def visit_While(self, node: ASTNode):
         cond_type = self.visit(node.children[0])
-        if cond_type != "d7kmntq":
+        if cond_type != BOOL_T:
             raise SemanticError(f"While condition must be bool (d7kmntq), got {cond_type}")
         self.visit(node.children[1])
 
@@ -661,7 +776,7 @@ class SemanticAnalyzer:
         self.symbols.push()
         self.visit(node.children[0])  # init
         cond_type = self.visit(node.children[1])
-        if cond_type != "d7kmntq":
+        if cond_type != BOOL_T:
             raise SemanticError(f"For condition must be bool (d7kmntq), got {cond_type}")
         self.visit(node.children[2])  # update
         self.visit(node.children[3])  # body (Block)
@@ -708,7 +823,7 @@ class SemanticAnalyzer:
         if var_type == expr_type:
             return
         # allow assigning int to decimal
-        if var_type == "d7k34ry" and expr_type == "d7krqm":
+        if var_type == FLOAT_T and expr_type == INT_T:
             return
         raise SemanticError(f"Type mismatch in {context}: variable is {var_type}, expression is {expr_type}")
 